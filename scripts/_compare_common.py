@@ -0,0 +1,168 @@
+"""Shared helpers for the estimate-comparison scripts.
+
+URL normalization, estimate-cell splitting, and workbook loading/validation
+live here so every comparison entry point applies identical matching rules,
+and so the lru_cache state behind the normalizers is shared when more than
+one workflow runs in the same process.
+"""
+
+import functools
+import re
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+import openpyxl
+import pandas as pd
+
+_SPLIT_RE = re.compile(r'[;\n\r]+')
+
+ESTIMATE_LINK_COL = 'estimate_link'
+YML_URL_COL = 'yml_url'
+CRITERIA_COL = 'criteria_passed'
+
+# --- URL normalization helpers ---
+
+@functools.lru_cache(maxsize=100_000)
+def _normalize_learn_url(url: str) -> str:
+    """Normalize Learn URLs for stable scenario matching.
+
+    Scalar counterpart of normalize_learn_url_series — the two MUST apply the
+    same ops in the same order, or keys derived through one will fail to
+    match keys derived through the other: strip whitespace, drop fragment and
+    query, trim trailing slashes, lowercase the whole URL.
+    """
+    if url is None:
+        return ''
+    u = str(url).strip()
+    if not u:
+        return ''
+    u = u.split('#', 1)[0].split('?', 1)[0].rstrip('/')
+    return u.lower()
+
+
+@functools.lru_cache(maxsize=100_000)
+def _normalize_estimate_url(url: str) -> str:
+    """Normalize estimate URLs so formatting differences don't create false mismatches.
+
+    Keeps only query params that define the estimate identity:
+      - shared-estimate
+      - service
+
+    Cached: each link is normalized when building inv_map, when splitting
+    estimate cells, and again during comparison — duplicates are common.
+    """
+    if url is None:
+        return ''
+    u = str(url).strip()
+    if not u:
+        return ''
+
+    parts = urlsplit(u)
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    path = parts.path.rstrip('/')
+
+    # Filter/sort the identity params by hand: parse_qsl + urlencode would run
+    # full percent-decode/encode round-trips we don't need, since both sides of
+    # every comparison go through this same normalizer.
+    pairs = []
+    for kv in parts.query.split('&'):
+        if '=' not in kv:
+            continue
+        k, _, v = kv.partition('=')
+        lk = k.lower()
+        if lk in ('shared-estimate', 'service') and v:
+            pairs.append((lk, v.strip()))
+    pairs.sort()
+    query = '&'.join(f'{k}={v}' for k, v in pairs)
+
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+
+def normalize_learn_url_series(s: pd.Series) -> pd.Series:
+    """Vectorized _normalize_learn_url for whole scenario-key columns.
+
+    Learn URLs have a simple fixed shape (lowercase host and path, no
+    meaningful query/fragment), so the normalization reduces to pandas .str
+    ops that run in C instead of a per-row urlsplit: strip whitespace, drop
+    fragment and query, trim trailing slashes, lowercase.
+    """
+    s = s.astype('string').str.strip()
+    s = s.str.split('#', n=1).str[0].str.split('?', n=1).str[0].str.rstrip('/')
+    return s.str.lower().fillna('')
+
+
+def _split_estimate_links(cell_value) -> list:
+    """Scan results may contain multiple estimate links per scenario.
+    Support newline-delimited and semicolon-delimited values.
+    """
+    if cell_value is None:
+        return []
+    s = str(cell_value).strip()
+    if not s:
+        return []
+
+    # one regex split instead of replace+splitlines (two string walks/allocations)
+    parts = [c.strip() for c in _SPLIT_RE.split(s) if c.strip()]
+
+    seen = set()
+    out = []
+    for p in parts:
+        n = _normalize_estimate_url(p)
+        if n and n not in seen:
+            seen.add(n)
+            out.append(n)
+    return out
+
+
+def _split_estimate_links_set(cell_value) -> frozenset:
+    """Set variant of _split_estimate_links for O(1) membership tests.
+
+    The SAME/NEW comparison only asks "is the inventory link among the scanned
+    links?", so callers on that path should prefer this over scanning the list.
+    """
+    return frozenset(_split_estimate_links(cell_value))
+
+
+# --- Workbook loading ---
+
+def _load_sheet_df(path: Path) -> pd.DataFrame:
+    """Stream the first worksheet into a DataFrame via openpyxl read_only mode.
+
+    pd.read_excel materializes the whole workbook DOM before returning; the
+    read_only iterator keeps memory bounded and only builds the rows we use.
+    """
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        return pd.DataFrame(rows, columns=list(header))
+    finally:
+        wb.close()
+
+
+def load_scan_and_inventory(scan_path: Path, est_path: Path):
+    """Load and validate the scan-results and estimate-inventory workbooks."""
+    scan_df = _load_sheet_df(scan_path)
+    est_df = _load_sheet_df(est_path)
+
+    required_scan = {YML_URL_COL, ESTIMATE_LINK_COL, CRITERIA_COL}
+    missing_scan = required_scan - set(scan_df.columns)
+    if missing_scan:
+        raise ValueError(
+            f"{scan_path} missing required columns: {sorted(missing_scan)}. "
+            f"Found columns: {list(scan_df.columns)}"
+        )
+
+    required_inv = {YML_URL_COL, ESTIMATE_LINK_COL}
+    missing_inv = required_inv - set(est_df.columns)
+    if missing_inv:
+        raise ValueError(
+            f"{est_path} missing required columns: {sorted(missing_inv)}. "
+            f"Found columns: {list(est_df.columns)}"
+        )
+
+    return scan_df, est_df
@@ -24,65 +24,109 @@ Evaluation pipeline columns (added 2026-04) — written in gate order after esti
 import argparse
 import json
 from pathlib import Path
-import pandas as pd
 import re
 
-AZURE_EXPERIENCE_RE = re.compile(r'^https?://azure\.com/e/[^\s]+$', re.IGNORECASE)
-SHARED_ESTIMATE_RE = re.compile(
-    r'^https?://azure\.microsoft\.com/(?:[a-z]{2}-[a-z]{2}/)?pricing/calculator/?\?[^\s]*shared-estimate=[^\s]+$',
+import xlsxwriter
+
+# Single alternation covering both compliant link shapes so each candidate URL
+# is classified in one regex call; the matched group name tells us which type hit.
+#   a) Azure Experience links (https://azure.com/e/*)
+#   b) Pricing Calculator shared-estimate links
+# No ^/$ anchors: matched via fullmatch, which lets the engine bail as soon
+# as the tail can no longer complete instead of emulating the $ anchor.
+ESTIMATE_LINK_RE = re.compile(
+    r'(?P<a>https?://azure\.com/e/[^\s]+)'
+    r'|(?P<b>https?://azure\.microsoft\.com/(?:[a-z]{2}-[a-z]{2}/)?pricing/calculator/?\?[^\s]*shared-estimate=[^\s]+)',
     re.IGNORECASE,
 )
 
 
+# Explicit output column order for the scan-results sheet. The streaming
+# writer indexes rows by these names directly — no dtype inference pass and a
+# stable header even when the scan produced zero items.
+COLUMNS = (
+    # ── Descriptive metadata ──────────────────────────────────────────
+    'title',
+    'description',
+    'azureCategories',
+    'ms.date',
+    'yml_url',
+    'image_download_urls',
+    # ── Pricing estimate ──────────────────────────────────────────────
+    'estimate_link',
+    # ── Evaluation pipeline (Gate 1 → 2 → 3) ─────────────────────────
+    'scan_status',
+    'in_scope',
+    'out_of_scope_reason',
+    'criteria_passed',
+    'failure_reason',
+    # ── Source paths ──────────────────────────────────────────────────
+    'yml_path',
+    'include_md_path',
+    # ── Authorship ────────────────────────────────────────────────────
+    'md_author_name',
+    'md_ms_author_name',
+)
+
+
+# Scanner output keys that may carry estimate-link candidates, in merge order.
+# usable_estimate_links is first and, in practice, usually the only one set.
+LINK_SOURCE_KEYS = (
+    'usable_estimate_links',
+    'azure_experience_links',
+    'shared_estimate_links',
+    'pricing_calculator_links',
+    'all_matching_links',
+    'calculator_other_links',
+    'calculator_shared_estimate_links',
+    'calculator_root_links',
+)
+
+
 def collect_estimate_links(item: dict) -> list:
     """Return ALL compliant estimate links (A/B), unique and deterministic order."""
-    candidates = []
-    for key in (
-        'usable_estimate_links',
-        'azure_experience_links',
-        'shared_estimate_links',
-        'pricing_calculator_links',
-        'all_matching_links',
-        'calculator_other_links',
-        'calculator_shared_estimate_links',
-        'calculator_root_links',
+    # Fast path: when usable_estimate_links is the only populated source —
+    # the common case — skip the multi-key merge entirely.
+    usable = item.get('usable_estimate_links')
+    if (
+        isinstance(usable, list)
+        and usable
+        and not any(item.get(k) for k in LINK_SOURCE_KEYS[1:])
     ):
-        vals = item.get(key) or []
-        if isinstance(vals, list):
-            candidates.extend([str(v).strip() for v in vals if v is not None])
-        elif vals:
-            candidates.append(str(vals).strip())
-
-    # de-dupe while preserving order
-    seen = set()
-    ordered = []
-    for u in candidates:
-        if not u or u in seen:
+        candidates = [str(v).strip() for v in usable if v is not None]
+    else:
+        candidates = []
+        for key in LINK_SOURCE_KEYS:
+            vals = item.get(key) or []
+            if isinstance(vals, list):
+                candidates.extend([str(v).strip() for v in vals if v is not None])
+            elif vals:
+                candidates.append(str(vals).strip())
+
+    # de-dupe while preserving order — dict.fromkeys runs in C
+    ordered = [u for u in dict.fromkeys(candidates) if u]
+
+    # single pass: bucket by matched group, then concat for stable ordering by type
+    buckets = {'a': [], 'b': []}
+    for u in ordered:
+        # cheap substring pre-checks: both compliant shapes require an azure
+        # prefix and one of the two markers, so most noise never hits the regex
+        lu = u.lower()
+        if not lu.startswith(('http://azure', 'https://azure')):
             continue
-        seen.add(u)
-        ordered.append(u)
-
-    out = []
-    out_seen = set()
-
-    def _add(regex):
-        for u in ordered:
-            if u in out_seen:
-                continue
-            if regex.match(u):
-                out_seen.add(u)
-                out.append(u)
-
-    # stable ordering by type
-    _add(AZURE_EXPERIENCE_RE)
-    _add(SHARED_ESTIMATE_RE)
+        if 'azure.com/e/' not in lu and 'shared-estimate=' not in lu:
+            continue
+        m = ESTIMATE_LINK_RE.fullmatch(u)
+        if m:
+            buckets[m.lastgroup].append(u)
 
-    return out
+    return buckets['a'] + buckets['b']
 
 
 def join_list(v):
     if isinstance(v, list):
-        return "\n".join([str(x) for x in v if x is not None])
+        # generator feeds str.join directly — no intermediate list allocation
+        return "\n".join(str(x) for x in v if x is not None)
     return '' if v is None else str(v)
 
 
@@ -124,11 +168,18 @@ def main():
             'md_ms_author_name': it.get('md_ms_author') or '',
         })
 
-    df = pd.DataFrame(rows)
-    with pd.ExcelWriter(args.output, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='scan-results', index=False)
-
-    print(f"Wrote {len(df)} rows to {args.output} (sheet: scan-results)")
+    # Stream rows straight to xlsxwriter — the output is values-only, so the
+    # pandas DataFrame/to_excel layer would only add per-cell conversion cost.
+    # constant_memory flushes each row as it is written (bounded RAM);
+    # strings_to_urls skips per-cell URL detection on the link columns.
+    wb = xlsxwriter.Workbook(args.output, {'constant_memory': True, 'strings_to_urls': False})
+    ws = wb.add_worksheet('scan-results')
+    ws.write_row(0, 0, COLUMNS)
+    for i, r in enumerate(rows, 1):
+        ws.write_row(i, 0, [r[c] for c in COLUMNS])
+    wb.close()
+
+    print(f"Wrote {len(rows)} rows to {args.output} (sheet: scan-results)")
 
 
 if __name__ == '__main__':
@@ -1,15 +1,28 @@
+import openpyxl
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
 import os
-from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from _compare_common import (
+    CRITERIA_COL,
+    ESTIMATE_LINK_COL,
+    YML_URL_COL,
+    _normalize_estimate_url,
+    _split_estimate_links_set,
+    load_scan_and_inventory,
+    normalize_learn_url_series,
+)
+
+try:
+    import lxml  # noqa: F401 — openpyxl's write_only mode streams via lxml when available
+except ImportError:
+    lxml = None
+    print("WARNING: lxml not installed; openpyxl write_only mode falls back to the slower built-in serializer")
 
 SCAN_RESULTS_PATH = Path('scan-results.xlsx')
 ESTIMATE_SCENARIOS_PATH = Path('estimate_scenarios.xlsx')
 
-ESTIMATE_LINK_COL = 'estimate_link'
-YML_URL_COL = 'yml_url'
-CRITERIA_COL = 'criteria_passed'
 STATUS_COL = 'comparison_status'
 IN_SCOPE_COL = 'in_scope'
 SCAN_STATUS_COL = 'scan_status'
@@ -20,93 +33,8 @@ STATUS_NEW_ESTIMATE = 'matched_existing_scenario_new_estimate'
 STATUS_NEW_CANDIDATE = 'new_estimate_candidate'
 STATUS_NOT_APPLICABLE = 'not_applicable'
 
-# --- URL normalization helpers ---
-
-def _normalize_learn_url(url: str) -> str:
-    """Normalize Learn URLs for stable scenario matching."""
-    if url is None:
-        return ''
-    u = str(url).strip()
-    if not u:
-        return ''
-    parts = urlsplit(u)
-    scheme = parts.scheme.lower()
-    netloc = parts.netloc.lower()
-    path = parts.path.rstrip('/')
-    return urlunsplit((scheme, netloc, path, '', ''))
-
-
-def _normalize_estimate_url(url: str) -> str:
-    """Normalize estimate URLs so formatting differences don't create false mismatches.
-
-    Keeps only query params that define the estimate identity:
-      - shared-estimate
-      - service
-    """
-    if url is None:
-        return ''
-    u = str(url).strip()
-    if not u:
-        return ''
-
-    parts = urlsplit(u)
-    scheme = parts.scheme.lower()
-    netloc = parts.netloc.lower()
-    path = parts.path.rstrip('/')
-
-    keep_keys = {'shared-estimate', 'service'}
-    q = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=False) if k.lower() in keep_keys]
-    q_sorted = sorted((k.lower(), (v or '').strip()) for k, v in q)
-    query = urlencode(q_sorted, doseq=True)
-
-    return urlunsplit((scheme, netloc, path, query, ''))
-
-
-def _split_estimate_links(cell_value) -> list:
-    """Scan results may contain multiple estimate links per scenario.
-    Support newline-delimited and semicolon-delimited values.
-    """
-    if cell_value is None:
-        return []
-    s = str(cell_value).strip()
-    if not s:
-        return []
-
-    parts = []
-    for chunk in s.replace(';', '\n').splitlines():
-        chunk = chunk.strip()
-        if chunk:
-            parts.append(chunk)
-
-    seen = set()
-    out = []
-    for p in parts:
-        n = _normalize_estimate_url(p)
-        if n and n not in seen:
-            seen.add(n)
-            out.append(n)
-    return out
-
-
 # --- Load data ---
-scan_df = pd.read_excel(SCAN_RESULTS_PATH)
-est_df = pd.read_excel(ESTIMATE_SCENARIOS_PATH)
-
-required_scan = {YML_URL_COL, ESTIMATE_LINK_COL, CRITERIA_COL}
-missing_scan = required_scan - set(scan_df.columns)
-if missing_scan:
-    raise ValueError(
-        f"scan-results.xlsx missing required columns: {sorted(missing_scan)}. "
-        f"Found columns: {list(scan_df.columns)}"
-    )
-
-required_inv = {YML_URL_COL, ESTIMATE_LINK_COL}
-missing_inv = required_inv - set(est_df.columns)
-if missing_inv:
-    raise ValueError(
-        f"estimate_scenarios.xlsx missing required columns: {sorted(missing_inv)}. "
-        f"Found columns: {list(est_df.columns)}"
-    )
+scan_df, est_df = load_scan_and_inventory(SCAN_RESULTS_PATH, ESTIMATE_SCENARIOS_PATH)
 
 # Ensure comparison_status exists
 if STATUS_COL not in scan_df.columns:
@@ -139,20 +67,15 @@ criteria_true = (
     | (scan_df[CRITERIA_COL] == True)
 )
 
-# Normalize scenario keys (Learn URL)
-scan_df['_scenario_key'] = scan_df[YML_URL_COL].astype(str).map(_normalize_learn_url)
-est_df['_scenario_key'] = est_df[YML_URL_COL].astype(str).map(_normalize_learn_url)
-
-# Build inventory map: one estimate link per scenario
-inv_map = {}
-for _, row in est_df.iterrows():
-    key = row.get('_scenario_key', '')
-    if not key:
-        continue
-    inv_link = _normalize_estimate_url(row.get(ESTIMATE_LINK_COL, ''))
-    if not inv_link:
-        continue
-    inv_map[key] = inv_link
+# Normalize scenario keys (Learn URL) — vectorized over the whole column
+scan_df['_scenario_key'] = normalize_learn_url_series(scan_df[YML_URL_COL])
+est_df['_scenario_key'] = normalize_learn_url_series(est_df[YML_URL_COL])
+
+# Build inventory map: one estimate link per scenario (vectorized — no iterrows)
+_inv_keys = est_df['_scenario_key']
+_inv_links = est_df[ESTIMATE_LINK_COL].astype(str).map(_normalize_estimate_url)
+_inv_mask = (_inv_keys != '') & (_inv_links != '')
+inv_map = dict(zip(_inv_keys[_inv_mask], _inv_links[_inv_mask]))
 
 matched_in_inventory = scan_df['_scenario_key'].isin(inv_map.keys())
 
@@ -166,13 +89,18 @@ scan_df.loc[in_scope_criteria_new, STATUS_COL] = STATUS_NEW_CANDIDATE
 # Split matched existing scenario into SAME vs NEW estimate link (in-scope only)
 applicable = in_scope & criteria_true & matched_in_inventory
 
-for idx, row in scan_df.loc[applicable].iterrows():
-    inv_link = inv_map.get(row['_scenario_key'], '')
-    scanned_links = _split_estimate_links(row.get(ESTIMATE_LINK_COL, ''))
-    if inv_link and any(l == inv_link for l in scanned_links):
-        scan_df.at[idx, STATUS_COL] = STATUS_SAME
-    else:
-        scan_df.at[idx, STATUS_COL] = STATUS_NEW_ESTIMATE
+# Vectorized SAME/NEW classification: look up the inventory link and split the
+# scanned cell once per row, then assign both statuses in two batch writes
+# instead of per-row .at[] scalar assignments.
+scan_df['_inv_link'] = scan_df['_scenario_key'].map(inv_map).fillna('')
+scan_df['_scanned_set'] = scan_df[ESTIMATE_LINK_COL].map(_split_estimate_links_set)
+same_mask = applicable & pd.Series(
+    [bool(inv) and inv in scanned
+     for inv, scanned in zip(scan_df['_inv_link'], scan_df['_scanned_set'])],
+    index=scan_df.index,
+)
+scan_df.loc[same_mask, STATUS_COL] = STATUS_SAME
+scan_df.loc[applicable & ~same_mask, STATUS_COL] = STATUS_NEW_ESTIMATE
 
 # needs-review: in-scope rows only that require follow-up action
 needs_review = scan_df[
@@ -240,7 +168,17 @@ summary = pd.DataFrame({
     ]
 })
 
-with pd.ExcelWriter(SCAN_RESULTS_PATH, engine='openpyxl', mode='w') as writer:
-    scan_df.drop(columns=['_scenario_key']).to_excel(writer, sheet_name='scan-results', index=False)
-    needs_review.drop(columns=['_scenario_key'], errors='ignore').to_excel(writer, sheet_name='needs-review', index=False)
-    summary.to_excel(writer, sheet_name='summary', index=False)
+def _write_df_sheet(wb, sheet_name: str, df):
+    """Stream a DataFrame into a write_only workbook, one row at a time."""
+    ws = wb.create_sheet(sheet_name)
+    ws.append(list(df.columns))
+    for row in df.itertuples(index=False, name=None):
+        ws.append([None if pd.isna(v) else v for v in row])
+
+
+_helper_cols = ['_scenario_key', '_inv_link', '_scanned_set']
+wb = openpyxl.Workbook(write_only=True)
+_write_df_sheet(wb, 'scan-results', scan_df.drop(columns=_helper_cols))
+_write_df_sheet(wb, 'needs-review', needs_review.drop(columns=_helper_cols, errors='ignore'))
+_write_df_sheet(wb, 'summary', summary)
+wb.save(SCAN_RESULTS_PATH)
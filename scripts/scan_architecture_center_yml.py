@@ -50,49 +50,289 @@ Outputs:
 """
 
 import argparse
+import contextlib
+import functools
 import json
+import mmap
 import os
 import re
+import shutil
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 try:
     import yaml  # PyYAML
+    try:
+        from yaml import CSafeLoader as _YamlSafeLoader  # libyaml — ~10x faster
+    except ImportError:
+        from yaml import SafeLoader as _YamlSafeLoader
 except Exception:
     yaml = None
+    _YamlSafeLoader = None
+
+try:
+    import orjson  # optional — serializes straight to bytes, ~5-10x faster
+except ImportError:
+    orjson = None
 
 INCLUDE_RE = re.compile(r"\[!INCLUDE\s*\[\s*\]\s*\(\s*([^\)\s]+\.md)\s*\)\s*\]", re.IGNORECASE)
 
-# Link detection
-AZURE_E_RE = re.compile(r"https?://azure\.com/e/[^\s\)\]\\\"']+", re.IGNORECASE)
-LOCALE_SEG = r"(?:[a-z]{2}-[a-z]{2}/)?"
-CALC_ANY_RE = re.compile(rf"https?://azure\.microsoft\.com/{LOCALE_SEG}pricing/calculator[^\s\)\]\\\"']*", re.IGNORECASE)
-CALC_ROOT_RE = re.compile(rf"https?://azure\.microsoft\.com/{LOCALE_SEG}pricing/calculator/?(?=$|[\s\)\]\\\"'])", re.IGNORECASE)
-SHARED_ESTIMATE_RE = re.compile(
-    rf"https?://azure\.microsoft\.com/{LOCALE_SEG}pricing/calculator/?\?[^\s\)\]\\\"']*shared-estimate=[^\s\)\]\\\"']+",
+# Link detection — one alternation so a single pass over the article text
+# finds both Azure Experience and Pricing Calculator URLs; per-URL subtyping
+# (shared-estimate / root / other) is done with cheap substring tests instead
+# of further regex sweeps.
+#
+# A linear-time engine (google-re2) was considered for these scans and
+# rejected: its Python wrapper does not expose the m.lastgroup dispatch the
+# fused alternations rely on, and the patterns here are not vulnerable to
+# backtracking blowup anyway — every quantified class excludes its closing
+# delimiter, so the re engine never needs to retry a position.
+#
+# The article-scanning patterns are compiled in bytes mode: md files are read
+# as raw bytes and never fully decoded — only the small matched fragments are
+# decoded when they enter the result record. Multibyte UTF-8 sequences are
+# >0x7f and therefore never collide with the ASCII delimiters these character
+# classes exclude, so bytes-mode matching is equivalent to str-mode.
+LOCALE_SEG = rb"(?:[a-z]{2}-[a-z]{2}/)?"
+COMBINED_URL_RE = re.compile(
+    rb"(?P<azexp>https?://azure\.com/e/[^\s\)\]\\\"']+)"
+    rb"|(?P<calc>https?://azure\.microsoft\.com/" + LOCALE_SEG + rb"pricing/calculator[^\s\)\]\\\"']*)",
     re.IGNORECASE,
 )
-# Image extraction (extension-agnostic)
-MD_INLINE_IMG_RE = re.compile(r"!\[[^\]]*\]\(([^\)]+)\)")
-MD_REF_IMG_USE_RE = re.compile(r"!\[[^\]]*\]\[([^\]]+)\]")
-MD_REF_DEF_RE = re.compile(r"(?im)^\[([^\]]+)\]:\s*(\S+)")
-DOCS_IMAGE_BLOCK_RE = re.compile(r"(?im)^\s*:::image\b[^\n]*")
-DOCS_IMAGE_SOURCE_RE = re.compile(r"(?i)\bsource\s*=\s*(?:\"([^\"]+)\"|'([^']+)'|([^\s>]+))")
-HTML_IMG_SRC_RE = re.compile(r"(?i)<img[^>]+\bsrc\s*=\s*(?:\"([^\"]+)\"|'([^']+)'|([^\s>]+))")
-HTML_SOURCE_SRCSET_RE = re.compile(r"(?i)<source[^>]+\bsrcset\s*=\s*(?:\"([^\"]+)\"|'([^']+)'|([^\s>]+))")
+# Image extraction (extension-agnostic) — one alternation covering every image
+# syntax, so extract_image_refs makes a single linear pass over the article
+# instead of one sweep per syntax family. The innermost capturing group that
+# fired identifies the branch via m.lastgroup. Reference definitions
+# ([key]: target lines) are a branch of the same pattern, so the definition
+# table fills in during the one pass instead of a separate whole-file scan.
+# The src/srcset/source values capture one group covering all three quote
+# styles (quotes included) rather than a group per style: a single group per
+# branch means one slot to fill per match, and clean_ref strips the quotes
+# anyway when the candidate is recorded.
+IMG_ANY_RE = re.compile(
+    rb"!\[[^\]]*\](?:\((?P<mdtgt>[^\)]+)\)|\[(?P<mdkey>[^\]]+)\])"
+    rb"|(?P<docs>^\s*:::image\b[^\n]*)"
+    rb"|<img[^>]+\bsrc\s*=\s*(?P<hsrc>\"[^\"]*\"|'[^']*'|[^\s>]+)"
+    rb"|<source[^>]+\bsrcset\s*=\s*(?P<ssrc>\"[^\"]*\"|'[^']*'|[^\s>]+)"
+    rb"|^\[(?P<defkey>[^\]]+)\]:\s*(?P<deftgt>\S+)",
+    re.IGNORECASE | re.MULTILINE,
+)
+DOCS_IMAGE_SOURCE_RE = re.compile(rb"(?i)\bsource\s*=\s*(\"[^\"]*\"|'[^']*'|[^\s>]+)")
 
 THUMB_EXCLUDE_RE = re.compile(r"(?i)(/browse/thumbs/|\bthumbs/|thumbnail|social_image|/icons/)")
 
 
-def load_yaml(path: Path) -> Optional[dict]:
+def iter_files(root, suffixes: Optional[tuple] = None):
+    """Recursive os.scandir walk yielding file paths (strings).
+
+    When suffixes is given, only matching names are yielded; otherwise every
+    file is yielded. DirEntry carries the file type from the directory read
+    itself, so this avoids the per-entry stat calls and Path allocations of
+    Path.rglob. Symlinked directories are not followed, so no path is yielded
+    twice.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        d = stack.pop()
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        stack.append(e.path)
+                    elif suffixes is None or e.name.endswith(suffixes):
+                        yield e.path
+        except OSError:
+            continue
+
+
+@functools.lru_cache(maxsize=100_000)
+def _path_exists(path: str) -> bool:
+    """Memoized os.path.exists for the out-of-docs-root image fallback.
+
+    Shared assets are referenced from many articles, so most lookups repeat;
+    the cache is per worker process but batches keep it warm.
+    """
+    return os.path.exists(path)
+
+
+def read_file_bytes(path) -> bytes:
+    """Read a whole file as bytes via os.open/os.read.
+
+    Skips the Path.open → TextIOWrapper → incremental-decoder stack; for the
+    thousands of small files a scan touches, the per-call overhead adds up.
+    """
+    fd = os.open(os.fspath(path), os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        buf = os.read(fd, size) if size else b''
+        while len(buf) < size:
+            chunk = os.read(fd, size - len(buf))
+            if not chunk:
+                break
+            buf += chunk
+        return buf
+    finally:
+        os.close(fd)
+
+
+_MMAP_MIN_SIZE = 16384  # below this a plain read is cheaper than a mapping
+
+
+@contextlib.contextmanager
+def md_buffer(path):
+    """Yield the file content as a bytes-like buffer for the regex passes.
+
+    Large articles are mmapped (zero-copy: the bytes patterns run straight on
+    the page cache and only matched fragments are copied out); small files
+    use the plain read helper. Note mmap objects support slicing and find()
+    but not the full bytes API — helpers consuming the buffer stick to that
+    common subset.
+    """
+    fd = os.open(os.fspath(path), os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        if size < _MMAP_MIN_SIZE:
+            buf = os.read(fd, size) if size else b''
+            while len(buf) < size:
+                chunk = os.read(fd, size - len(buf))
+                if not chunk:
+                    break
+                buf += chunk
+            yield buf
+            return
+        mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    finally:
+        os.close(fd)
+    try:
+        yield mm
+    finally:
+        mm.close()
+
+
+def load_yaml_bytes(raw: bytes) -> Optional[dict]:
     if yaml is None:
         return None
     try:
-        return yaml.safe_load(path.read_text(encoding='utf-8', errors='ignore'))
+        # raw bytes: libyaml decodes UTF-8 itself, skipping a Python-level pass
+        return yaml.load(raw, Loader=_YamlSafeLoader)
     except Exception:
         return None
 
 
+# Fast metadata path for YAML files without an include directive. Files that
+# never reach Gate 1's include checks only contribute their metadata fields to
+# the output row, and the common shape there is a flat mapping of plain
+# scalars (plus the metadata: sub-block and the azureCategories list). For
+# those, a line scan recovers everything extract_yaml_meta needs without a
+# full libyaml parse. Anything the scanner is not absolutely sure about —
+# block scalars, flow collections, anchors, quoting it can't close, possible
+# trailing comments, wrapped multi-line plain scalars, scalars YAML would
+# type (bool/int/null/date/...), quoted values carrying escapes — makes it
+# bail to the real parser, so it never returns a dict that differs from
+# yaml.load's.
+#
+# The value group must be empty or start with whitespace: 'key:value' with
+# no space is not YAML and has to reach the real parser to fail there.
+_FAST_KEY_RE = re.compile(r"^([A-Za-z_][\w.\-]*):(\s.*)?$")
+
+# PyYAML's implicit-tag resolver, used to reject plain scalars that the real
+# loader would return typed (True, 5, dates, None, sexagesimal ints, ...)
+_YAML_RESOLVER = yaml.resolver.Resolver() if yaml is not None else None
+_STR_TAG = 'tag:yaml.org,2002:str'
+
+
+def _fast_scalar(v: str):
+    """Return (ok, value) for a plain scalar; ok=False forces full parse."""
+    v = v.strip()
+    if not v:
+        return True, None
+    if v[0] in '|>&*{[@`#' or '\t' in v or ' #' in v:
+        return False, None
+    if v[0] in '"\'':
+        if len(v) >= 2 and v[-1] == v[0]:
+            inner = v[1:-1]
+            # an embedded quote char or backslash means escape processing —
+            # the real scanner's job
+            if v[0] in inner or '\\' in inner:
+                return False, None
+            return True, inner
+        return False, None
+    if ': ' in v or v.endswith(':'):
+        # either a nested mapping or a YAML error — not a plain scalar
+        return False, None
+    if _YAML_RESOLVER.resolve(yaml.nodes.ScalarNode, v, (True, False)) != _STR_TAG:
+        return False, None
+    return True, v
+
+
+def _fast_yaml_scan(raw: bytes) -> Optional[dict]:
+    """Best-effort parse of a simple flat YAML mapping; None = use yaml.load."""
+    if yaml is None:
+        # without PyYAML there is no resolver to vet scalars against and no
+        # fallback parser — callers get the same "could not parse" outcome
+        return None
+    try:
+        text = raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+    data: dict = {}
+    meta: Optional[dict] = None   # set while inside the metadata: block
+    list_key: Optional[str] = None  # top-level key collecting '- item' lines
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        if line[0] not in ' \t-':
+            # new top-level key
+            m = _FAST_KEY_RE.match(line)
+            if not m:
+                return None
+            meta = None
+            list_key = None
+            key, rest = m.group(1), m.group(2)
+            ok, val = _fast_scalar(rest or '')
+            if not ok:
+                return None
+            if val is None and key == 'metadata':
+                meta = data[key] = {}
+            else:
+                data[key] = val
+                if val is None:
+                    list_key = key
+            continue
+        if stripped.startswith('- '):
+            # sequence item for the pending top-level key
+            if list_key is None:
+                return None
+            ok, item = _fast_scalar(stripped[2:])
+            if not ok or item is None:
+                return None
+            if ': ' in item or item.endswith(':'):
+                # '- key: value' is a mapping item, not a plain scalar
+                return None
+            if data[list_key] is None:
+                data[list_key] = []
+            data[list_key].append(item)
+            continue
+        if meta is not None:
+            # simple scalar key inside the metadata: block
+            m = _FAST_KEY_RE.match(stripped)
+            if not m:
+                return None
+            ok, val = _fast_scalar(m.group(2) or '')
+            if not ok or val is None:
+                return None
+            meta[m.group(1)] = val
+            continue
+        # indented line that is neither a list item nor a metadata: entry —
+        # a wrapped multi-line plain scalar folds into the previous value,
+        # which this scan cannot reproduce, so hand the file to yaml.load
+        return None
+    return data
+
+
 def as_list(val):
     if val is None:
         return []
@@ -112,136 +352,248 @@ def clean_ref(ref: str) -> str:
     return ref.strip('"').strip("'").strip().strip('()<>[]')
 
 
-def resolve_repo_rel(base_dir: Path, ref: str, repo_root: Path) -> Optional[str]:
+def _has_url_scheme(ref: str) -> bool:
+    """True when ref starts with a URL scheme like https:// (str-op version
+    of the old ^[a-zA-Z]+:// regex — no pattern dispatch on the hot path)."""
+    i = ref.find('://')
+    return 0 < i and ref[:i].isalpha()
+
+
+@functools.lru_cache(maxsize=200_000)
+def resolve_repo_rel(base_dir: str, ref: str, root_prefix: str) -> Optional[str]:
+    """Resolve a doc-relative reference to a repo-relative posix path.
+
+    root_prefix is the resolved repo root plus trailing separator — callers
+    compute it once per run. Containment is a plain string-prefix test on the
+    normalized joined path: no Path allocation, no realpath syscalls, and no
+    ValueError-as-control-flow for references that escape the repo.
+
+    Memoized on the (base_dir, ref) pair: shared includes and media assets are
+    referenced from many articles, and the resolution is a pure string
+    function of its arguments.
+    """
     ref = clean_ref(ref)
     if not ref:
         return None
-    if re.match(r"^[a-zA-Z]+://", ref):
+    if _has_url_scheme(ref):
         return None
     ref = strip_query_fragment(ref)
     while ref.startswith('./'):
         ref = ref[2:]
     ref = ref.lstrip('/')
-    p = (base_dir / ref).resolve()
-    try:
-        return p.relative_to(repo_root.resolve()).as_posix()
-    except Exception:
-        return None
+    p_str = os.path.abspath(os.path.join(os.fspath(base_dir), ref))
+    if p_str.startswith(root_prefix):
+        return p_str[len(root_prefix):].replace(os.sep, '/')
+    return None
+
 
+# URL builders run per file and per image, but repo_slug/branch never change
+# within a run — callers precompute the two GitHub prefixes once (see scan)
+# so each call is a single concatenation instead of an f-string format.
+_LEARN_PREFIX = "https://learn.microsoft.com/en-us/azure/architecture/"
 
-def make_raw_url(repo_slug: str, branch: str, repo_rel_path: str) -> str:
-    return f"https://raw.githubusercontent.com/{repo_slug}/{branch}/{repo_rel_path.lstrip('/')}"
 
+# Plain concatenation: repo-relative paths never carry a leading slash —
+# they come from os.path.relpath or from slicing off root_prefix (which ends
+# with the separator) — so no per-call lstrip is needed.
+def make_raw_url(raw_prefix: str, repo_rel_path: str) -> str:
+    return raw_prefix + repo_rel_path
 
-def make_github_blob_url(repo_slug: str, branch: str, repo_rel_path: str) -> str:
-    return f"https://github.com/{repo_slug}/blob/{branch}/{repo_rel_path.lstrip('/')}"
+
+def make_github_blob_url(blob_prefix: str, repo_rel_path: str) -> str:
+    return blob_prefix + repo_rel_path
 
 
 def make_learn_url_from_docs_path(repo_rel_path: str) -> str:
-    p = repo_rel_path.replace('\\', '/')
-    if p.startswith('docs/'):
-        p = p[len('docs/'):]
+    # file discovery only admits lowercase .yml/.yaml/.md, so the suffix test
+    # does not need a lowercasing pass here
+    p = repo_rel_path.replace('\\', '/').removeprefix('docs/')
     for ext in ('.yml', '.yaml', '.md'):
-        if p.lower().endswith(ext):
+        if p.endswith(ext):
             p = p[:-len(ext)]
             break
-    return f"https://learn.microsoft.com/en-us/azure/architecture/{p}"
+    return _LEARN_PREFIX + p
 
 
-def parse_md_front_matter(md_text: str) -> dict:
-    if not md_text.startswith('---'):
+def parse_md_front_matter(md_bytes) -> dict:
+    # slice compares instead of startswith — md_bytes may be an mmap. The
+    # opener must be '---' alone on its line, so requiring the newline (LF or
+    # CRLF) rejects '----'/'---x' lookalikes before any further scanning.
+    if md_bytes[:3] != b'---' or md_bytes[3:4] not in (b'\n', b'\r'):
         return {}
-    end = md_text.find('\n---', 3)
+    end = md_bytes.find(b'\n---', 3)
     if end == -1:
         return {}
-    fm_text = md_text[3:end]
+    fm_bytes = md_bytes[3:end]
+    # Front matter is almost always a flat mapping of plain scalars (title,
+    # description, author, ms.*) plus the occasional list — exactly what the
+    # fast line scan covers, so most files skip the per-md libyaml parse.
+    d = _fast_yaml_scan(fm_bytes)
+    if d is not None:
+        return d
     if yaml is None:
         return {}
     try:
-        d = yaml.safe_load(fm_text)
+        d = yaml.load(fm_bytes, Loader=_YamlSafeLoader)
         return d if isinstance(d, dict) else {}
     except Exception:
         return {}
 
 
-def extract_reference_map(md_text: str) -> Dict[str, str]:
-    return {k.strip().lower(): clean_ref(v) for k, v in MD_REF_DEF_RE.findall(md_text)}
-
-
-def add_candidate(out: List[str], raw: str):
+def add_candidate(out: Dict[str, None], raw: str):
     raw = clean_ref(raw)
     if not raw:
         return
     if THUMB_EXCLUDE_RE.search(raw):
         return
-    out.append(raw)
-
-
-def extract_image_refs(md_text: str) -> List[str]:
-    refs: List[str] = []
-
-    for raw in MD_INLINE_IMG_RE.findall(md_text):
-        add_candidate(refs, raw)
-
-    for line in DOCS_IMAGE_BLOCK_RE.findall(md_text):
-        m = DOCS_IMAGE_SOURCE_RE.search(line)
-        if not m:
-            continue
-        add_candidate(refs, m.group(1) or m.group(2) or m.group(3) or '')
-
-    for g1, g2, g3 in HTML_IMG_SRC_RE.findall(md_text):
-        add_candidate(refs, g1 or g2 or g3 or '')
+    out[raw] = None  # dict insertion dedupes while keeping first-seen order
+
+
+def extract_image_refs(md_bytes) -> List[str]:
+    # Sigil pre-checks: every image syntax starts with a fixed marker, and a
+    # bytes `in` test is a vectorized libc memmem — far cheaper than letting
+    # each regex sweep the file just to find nothing. The markers are kept
+    # case-safe: `!`, `:::` and `<` appear regardless of how the tag itself
+    # is capitalized, so no case-insensitive match can slip past a gate.
+    # find() instead of `in` — md_bytes may be an mmap, which indexes as ints
+    # and would make a bytes containment test silently always-False
+    has_bang = md_bytes.find(b'![') != -1   # ![inline](...) and ![ref][...]
+    has_block = md_bytes.find(b':::') != -1  # :::image blocks
+    has_tag = md_bytes.find(b'<') != -1      # <img>/<source> HTML
+    if not (has_bang or has_block or has_tag):
+        return []
 
-    for g1, g2, g3 in HTML_SOURCE_SRCSET_RE.findall(md_text):
-        raw = (g1 or g2 or g3 or '')
-        if raw:
-            raw = raw.split(',')[0].strip().split()[0]
-        add_candidate(refs, raw)
+    # Candidates are collected in document order; reference-style uses are
+    # deferred as 1-tuples because their definition may appear later in the
+    # file, then resolved against the completed table without losing their
+    # position in the order.
+    entries: List = []
+    ref_defs: Dict[str, str] = {}
+
+    for m in IMG_ANY_RE.finditer(md_bytes):
+        kind = m.lastgroup
+        if kind == 'mdtgt':
+            entries.append(m.group('mdtgt').decode('utf-8', 'ignore'))
+        elif kind == 'mdkey':
+            entries.append((m.group('mdkey').decode('utf-8', 'ignore').strip().lower(),))
+        elif kind == 'docs':
+            src = DOCS_IMAGE_SOURCE_RE.search(m.group('docs'))
+            if src:
+                entries.append(src.group(1).decode('utf-8', 'ignore'))
+        elif kind == 'hsrc':
+            entries.append(m.group('hsrc').decode('utf-8', 'ignore'))
+        elif kind == 'deftgt':
+            key = m.group('defkey').decode('utf-8', 'ignore').strip().lower()
+            ref_defs[key] = m.group('deftgt').decode('utf-8', 'ignore')
+        else:  # 'ssrc' — srcset: take the first candidate URL
+            raw = m.group('ssrc').decode('utf-8', 'ignore')
+            if raw:
+                raw = raw.split(',')[0].strip().split()[0]
+            entries.append(raw)
+
+    refs: Dict[str, None] = {}
+    for entry in entries:
+        if isinstance(entry, tuple):
+            target = ref_defs.get(entry[0])
+            if target:
+                add_candidate(refs, target)
+        else:
+            add_candidate(refs, entry)
+    return list(refs)
 
-    ref_map = extract_reference_map(md_text)
-    for key in MD_REF_IMG_USE_RE.findall(md_text):
-        target = ref_map.get(key.strip().lower())
-        if target:
-            add_candidate(refs, target)
 
-    seen = set()
-    out: List[str] = []
-    for r in refs:
-        if r and r not in seen:
-            seen.add(r)
-            out.append(r)
-    return out
+def _is_shared_estimate(u: str) -> bool:
+    """True when a calculator URL carries a non-empty shared-estimate param.
 
+    Substring equivalent of the old SHARED_ESTIMATE_RE: the query must start
+    right after .../pricing/calculator[/] and shared-estimate= must be
+    followed by at least one character.
+    """
+    lu = u.lower()
+    q = lu.find('?')
+    if q == -1:
+        return False
+    if not lu[:q].endswith(('/pricing/calculator', '/pricing/calculator/')):
+        return False
+    i = lu.find('shared-estimate=', q)
+    return i != -1 and i + len('shared-estimate=') < len(lu)
+
+
+# Shared empty result for articles with no calculator/estimate URLs — the
+# common case. Callers assign these lists into records wholesale (same
+# invariant as _BASE_TEMPLATE), so one frozen instance serves every miss.
+_EMPTY_LIST: list = []
+_EMPTY_LINK_INFO = {
+    'azure_experience_links': _EMPTY_LIST,
+    'calculator_root_links': _EMPTY_LIST,
+    'calculator_shared_estimate_links': _EMPTY_LIST,
+    'calculator_other_links': _EMPTY_LIST,
+    'shared_estimate_links': _EMPTY_LIST,
+    'pricing_calculator_links': _EMPTY_LIST,
+    'all_matching_links': _EMPTY_LIST,
+    'usable_estimate_links': _EMPTY_LIST,
+}
+
+
+def categorize_links(md_bytes) -> dict:
+    # Substring pre-check before the regex: most articles carry no pricing
+    # links at all, and bytes find() is a SIMD memmem. The buffer is
+    # lowercased first — one C pass, still ~20x cheaper than the regex walk
+    # on a miss — so the gate accepts every case variant the IGNORECASE
+    # COMBINED_URL_RE does. (bytes() materializes mmap buffers; for bytes it
+    # is a no-op returning the same object.)
+    low = bytes(md_bytes).lower()
+    if (low.find(b'pricing/calculator') == -1
+            and low.find(b'azure.com/e/') == -1):
+        return _EMPTY_LINK_INFO
+
+    azexp_set = set()
+    calc_set = set()
+    for m in COMBINED_URL_RE.finditer(md_bytes):
+        u = m.group().decode('utf-8', 'ignore')
+        if m.lastgroup == 'azexp':
+            azexp_set.add(u)
+        else:
+            calc_set.add(u)
 
-def categorize_links(md_text: str) -> dict:
-    azure_experience_links = sorted(set(AZURE_E_RE.findall(md_text)))
-    calc_any = sorted(set(CALC_ANY_RE.findall(md_text)))
+    # Each bucket is sorted exactly once. calc_any is sorted and unique, so
+    # views filtered from it in order (shared_est, calc_other) inherit both
+    # properties without their own set+sort pass; only calc_root re-dedupes,
+    # because the rstrip cleanup can collapse distinct inputs.
+    azure_experience_links = sorted(azexp_set)
+    calc_any = sorted(calc_set)
 
-    shared_est = sorted({u for u in calc_any if SHARED_ESTIMATE_RE.search(u)})
+    shared_est = [u for u in calc_any if _is_shared_estimate(u)]
 
     calc_root: List[str] = []
     calc_other: List[str] = []
     for u in calc_any:
         u_clean = u.rstrip(').,;')
-        if CALC_ROOT_RE.match(u_clean) and ('?' not in u_clean) and ('#' not in u_clean):
+        # root = nothing after .../pricing/calculator[/] — no query, no fragment
+        if (
+            u_clean.lower().endswith(('/pricing/calculator', '/pricing/calculator/'))
+            and ('?' not in u_clean)
+            and ('#' not in u_clean)
+        ):
             calc_root.append(u_clean)
         else:
             calc_other.append(u)
 
     calc_root = sorted(set(calc_root))
-    calc_other = sorted(set(calc_other))
-
-    shared_estimate_links = sorted(set(azure_experience_links + shared_est))
-    all_matching_links = sorted(set(azure_experience_links + calc_any))
 
-    usable_estimate_links = sorted(set(azure_experience_links + shared_est))
+    # usable_estimate_links and shared_estimate_links are the same union by
+    # definition (Azure Experience + calculator shared-estimate) — build the
+    # merged list once and let both keys reference it. The unions are set
+    # operations on the already-built sets, sorted once at the end.
+    usable_estimate_links = sorted(azexp_set.union(shared_est))
+    all_matching_links = sorted(azexp_set | calc_set)
 
     return {
         'azure_experience_links': azure_experience_links,
         'calculator_root_links': calc_root,
         'calculator_shared_estimate_links': shared_est,
         'calculator_other_links': calc_other,
-        'shared_estimate_links': shared_estimate_links,
+        'shared_estimate_links': usable_estimate_links,
         'pricing_calculator_links': calc_any,
         'all_matching_links': all_matching_links,
         'usable_estimate_links': usable_estimate_links,
@@ -259,39 +611,47 @@ def extract_yaml_meta(data: dict) -> Tuple[Optional[str], Optional[str], List[st
     return title, description, azure_categories, author, ms_author, ms_date
 
 
-def _make_base_record(repo_slug: str, branch: str) -> dict:
+# Template for result records: every file produces the same ~28 keys, so each
+# record is a C-level dict copy of this template instead of a fresh literal.
+# The empty-list defaults are shared sentinels — the pipeline only ever
+# *replaces* list fields wholesale (never .append on a record field), so a
+# record that keeps a default shares the one module-level empty list.
+_BASE_TEMPLATE = {
+    'scan_status': 'ok',
+    'criteria_passed': False,
+    'failure_reason': '',
+    'title': None,
+    'description': None,
+    'azureCategories': [],
+    'ms_date': None,
+    'yml_url': None,
+    'yml_github_url': None,
+    'yml_path': None,
+    'include_md_path': None,
+    'include_md_github_url': None,
+    'md_author_github': None,
+    'md_ms_author': None,
+    'image_paths': [],
+    'image_download_urls': [],
+    'image_exists_in_repo': [],
+    'image_formats': [],
+    'azure_experience_links': [],
+    'calculator_root_links': [],
+    'calculator_shared_estimate_links': [],
+    'calculator_other_links': [],
+    'pricing_calculator_links': [],
+    'shared_estimate_links': [],
+    'all_matching_links': [],
+    'usable_estimate_links': [],
+    # Scope gate — populated after md content is scanned
+    'in_scope': False,
+    'out_of_scope_reason': '',
+}
+
+
+def _make_base_record() -> dict:
     """Return an empty result record with all expected keys."""
-    return {
-        'scan_status': 'ok',
-        'criteria_passed': False,
-        'failure_reason': '',
-        'title': None,
-        'description': None,
-        'azureCategories': [],
-        'ms_date': None,
-        'yml_url': None,
-        'yml_github_url': None,
-        'yml_path': None,
-        'include_md_path': None,
-        'include_md_github_url': None,
-        'md_author_github': None,
-        'md_ms_author': None,
-        'image_paths': [],
-        'image_download_urls': [],
-        'image_exists_in_repo': [],
-        'image_formats': [],
-        'azure_experience_links': [],
-        'calculator_root_links': [],
-        'calculator_shared_estimate_links': [],
-        'calculator_other_links': [],
-        'pricing_calculator_links': [],
-        'shared_estimate_links': [],
-        'all_matching_links': [],
-        'usable_estimate_links': [],
-        # Scope gate — populated after md content is scanned
-        'in_scope': False,
-        'out_of_scope_reason': '',
-    }
+    return _BASE_TEMPLATE.copy()
 
 
 
@@ -339,13 +699,36 @@ def evaluate_scope(base: dict) -> None:
     base['out_of_scope_reason'] = '; '.join(reasons)
 
 
+def _image_row(raw: str, md_parent: str, repo_root: str, root_prefix: str,
+               repo_files: set, docs_prefix: str, raw_prefix: str) -> tuple:
+    """Resolve one raw image reference to its (path, url, exists, format) row."""
+    cleaned = clean_ref(raw)
+    img_rel = resolve_repo_rel(md_parent, cleaned, root_prefix)
+    if img_rel is None:
+        img_rel = strip_query_fragment(cleaned).lstrip('/')
+    # indexed docs paths are answered from the walk; only references that
+    # point outside docs_root still need a stat()
+    exists = img_rel in repo_files or (
+        not img_rel.startswith(docs_prefix)
+        and _path_exists(os.path.join(repo_root, img_rel))
+    )
+    # suffix of the basename only — a dot in a directory name is not an
+    # extension, and a leading dot marks a hidden file, not a format
+    slash = img_rel.rfind('/')
+    dot = img_rel.rfind('.')
+    fmt = img_rel[dot + 1:].lower() if dot > slash + 1 else ''
+    return img_rel, make_raw_url(raw_prefix, img_rel), exists, fmt
+
+
 def _scan_md_content(
     base: dict,
-    md_file: Path,
-    md_text: str,
-    repo_root: Path,
-    repo_slug: str,
-    branch: str,
+    md_file: str,
+    md_bytes,
+    repo_root: str,
+    root_prefix: str,
+    repo_files: set,
+    docs_prefix: str,
+    raw_prefix: str,
     counts: dict,
     failures: list,
     debug: bool,
@@ -358,7 +741,7 @@ def _scan_md_content(
     called at the end, after all content fields are populated.
     """
     base['scan_status'] = 'ok'  # Gate 1 passed — file resolved and content found
-    link_info = categorize_links(md_text)
+    link_info = categorize_links(md_bytes)
     for k, v in link_info.items():
         if k in base:
             base[k] = v
@@ -370,26 +753,19 @@ def _scan_md_content(
     if has_usable:
         counts['md_has_usable_estimate_link'] += 1
 
-    img_refs = extract_image_refs(md_text)
-    image_paths: List[str] = []
-    image_download_urls: List[str] = []
-    image_exists: List[bool] = []
-    image_formats: List[str] = []
-    for raw in img_refs:
-        cleaned = clean_ref(raw)
-        img_rel = resolve_repo_rel(md_file.parent, cleaned, repo_root)
-        if img_rel is None:
-            img_rel = strip_query_fragment(cleaned).lstrip('/')
-        image_paths.append(img_rel)
-        image_download_urls.append(make_raw_url(repo_slug, branch, img_rel))
-        exists = bool((repo_root / img_rel).exists())
-        image_exists.append(exists)
-        image_formats.append(Path(img_rel).suffix.lower().lstrip('.'))
-
-    base['image_paths'] = image_paths
-    base['image_download_urls'] = image_download_urls
-    base['image_exists_in_repo'] = image_exists
-    base['image_formats'] = image_formats
+    img_refs = extract_image_refs(md_bytes)
+    if img_refs:
+        md_parent = os.path.dirname(md_file)
+        rows = [
+            _image_row(raw, md_parent, repo_root, root_prefix,
+                       repo_files, docs_prefix, raw_prefix)
+            for raw in img_refs
+        ]
+        # one row tuple per image, unzipped into the four parallel columns in
+        # a single step — no four-way append per iteration
+        (base['image_paths'], base['image_download_urls'],
+         base['image_exists_in_repo'], base['image_formats']) = map(list, zip(*rows))
+    # no images: the template's shared empty-list sentinels stay in place
 
     if has_usable:
         base['criteria_passed'] = True
@@ -415,147 +791,194 @@ def _scan_md_content(
         counts['out_of_scope'] += 1
 
 
-def scan(repo_root: Path, repo_slug: str, branch: str, docs_root: str, debug: bool):
-    docs_path = repo_root / docs_root
-    yml_files = list(docs_path.rglob('*.yml')) + list(docs_path.rglob('*.yaml'))
-    yml_files = sorted({p.resolve(): p for p in yml_files}.values(), key=lambda p: str(p))
-
-    counts = {
-        'yml_total': len(yml_files),
-        'yml_parsed': 0,
-        'has_include': 0,
-        'include_md_exists': 0,
-        'standalone_md_total': 0,
-        'standalone_md_scanned': 0,
-        'md_has_any_calc_link': 0,
-        'md_has_usable_estimate_link': 0,
-        'in_scope': 0,
-        'out_of_scope': 0,
-        'passed': 0,
-        'failed': 0,
-    }
+# --- Pass 1 workers ---------------------------------------------------------
+# Per-YAML work (parse the YAML, read one md file, run the regexes) is
+# independent and CPU-bound, so Pass 1 fans out across cores with a process
+# pool. The shared read-only context (repo paths, file index) is handed to
+# each worker process once via the pool initializer instead of being pickled
+# into every task; the regex/YAML module state comes along with the import.
+
+_PARALLEL_MIN_FILES = 64  # below this, pool startup costs more than it saves
+
+_COUNT_KEYS = (
+    'yml_total',
+    'yml_parsed',
+    'has_include',
+    'include_md_exists',
+    'standalone_md_total',
+    'standalone_md_scanned',
+    'md_has_any_calc_link',
+    'md_has_usable_estimate_link',
+    'in_scope',
+    'out_of_scope',
+    'passed',
+    'failed',
+)
 
-    failures = []
-    results = []
+_CTX: dict = {}
 
-    # --- Pass 1: YML+MD pattern (existing behaviour) ---
-    # Track every .md path that is consumed as an [!INCLUDE] target so we can
-    # exclude them from the standalone-MD pass below.
-    included_md_paths: set = set()  # resolved absolute paths
 
-    for yml_path in yml_files:
-        repo_rel_yml = yml_path.relative_to(repo_root).as_posix()
+def _new_counts() -> dict:
+    return dict.fromkeys(_COUNT_KEYS, 0)
 
-        base = _make_base_record(repo_slug, branch)
-        base['yml_url'] = make_learn_url_from_docs_path(repo_rel_yml)
-        base['yml_github_url'] = make_github_blob_url(repo_slug, branch, repo_rel_yml)
-        base['yml_path'] = repo_rel_yml
 
-        data = load_yaml(yml_path)
-        if not isinstance(data, dict):
-            _mark_scan_error(base, 'yaml_parse_failed', counts)
-            results.append(base)
-            if debug:
-                failures.append({'yml_path': repo_rel_yml, 'reason': base['scan_status']})
-            continue
+def _init_worker(repo_root: str, root_prefix: str, repo_slug: str,
+                 branch: str, repo_files: set, docs_prefix: str, debug: bool) -> None:
+    _CTX.update(
+        repo_root=repo_root,
+        root_prefix=root_prefix,
+        repo_slug=repo_slug,
+        branch=branch,
+        repo_files=repo_files,
+        docs_prefix=docs_prefix,
+        debug=debug,
+        raw_prefix=f"https://raw.githubusercontent.com/{repo_slug}/{branch}/",
+        blob_prefix=f"https://github.com/{repo_slug}/blob/{branch}/",
+    )
 
-        counts['yml_parsed'] += 1
-        title, description, azure_categories, y_author, y_ms_author, ms_date = extract_yaml_meta(data)
-        base['title'] = title
-        base['description'] = description
-        base['azureCategories'] = azure_categories
-        base['ms_date'] = ms_date
-
-        content = data.get('content')
-        if not isinstance(content, str):
-            _mark_scan_error(base, 'missing_content_string', counts)
-            results.append(base)
-            if debug:
-                failures.append({'yml_path': repo_rel_yml, 'reason': base['scan_status']})
-            continue
 
-        inc = INCLUDE_RE.search(content)
-        if not inc:
-            _mark_scan_error(base, 'no_include_directive', counts)
-            results.append(base)
-            if debug:
-                failures.append({'yml_path': repo_rel_yml, 'reason': base['scan_status']})
-            continue
+def _process_one_yml(yml_path_str: str):
+    """Scan a single YAML file using the context installed by _init_worker.
 
-        counts['has_include'] += 1
+    Returns (record, counts_delta, failures, included_md) where counts_delta
+    and failures are merged by the driver, and included_md is the resolved
+    absolute path of the [!INCLUDE] target (or None) so Pass 2 can skip md
+    files already consumed here.
+    """
+    repo_root = _CTX['repo_root']
+    root_prefix = _CTX['root_prefix']
+    repo_slug = _CTX['repo_slug']
+    branch = _CTX['branch']
+    repo_files = _CTX['repo_files']
+    docs_prefix = _CTX['docs_prefix']
+    debug = _CTX['debug']
+    raw_prefix = _CTX['raw_prefix']
+    blob_prefix = _CTX['blob_prefix']
+
+    counts = _new_counts()
+    failures: list = []
+    included_md = None
+
+    repo_rel_yml = os.path.relpath(yml_path_str, repo_root).replace(os.sep, '/')
+
+    base = _make_base_record()
+    base['yml_url'] = make_learn_url_from_docs_path(repo_rel_yml)
+    base['yml_github_url'] = make_github_blob_url(blob_prefix, repo_rel_yml)
+    base['yml_path'] = repo_rel_yml
+
+    raw = read_file_bytes(yml_path_str)
+    # Two-tier parse: without the include directive's bytes the file can never
+    # pass Gate 1, so only its metadata matters — try the cheap line scan
+    # first and keep libyaml for include-bearing or non-trivial files.
+    data = None
+    if b'[!INCLUDE' not in raw and b'[!include' not in raw:
+        data = _fast_yaml_scan(raw)
+    if data is None:
+        data = load_yaml_bytes(raw)
+    if not isinstance(data, dict):
+        _mark_scan_error(base, 'yaml_parse_failed', counts)
+        if debug:
+            failures.append({'yml_path': repo_rel_yml, 'reason': base['scan_status']})
+        return base, counts, failures, included_md
+
+    counts['yml_parsed'] += 1
+    title, description, azure_categories, y_author, y_ms_author, ms_date = extract_yaml_meta(data)
+    base['title'] = title
+    base['description'] = description
+    base['azureCategories'] = azure_categories
+    base['ms_date'] = ms_date
+
+    content = data.get('content')
+    if not isinstance(content, str):
+        _mark_scan_error(base, 'missing_content_string', counts)
+        if debug:
+            failures.append({'yml_path': repo_rel_yml, 'reason': base['scan_status']})
+        return base, counts, failures, included_md
+
+    # '[!' opens every include directive regardless of case — a memmem
+    # containment test that skips the regex walk for content blocks that
+    # plainly hold no directive
+    inc = INCLUDE_RE.search(content) if '[!' in content else None
+    if not inc:
+        _mark_scan_error(base, 'no_include_directive', counts)
+        if debug:
+            failures.append({'yml_path': repo_rel_yml, 'reason': base['scan_status']})
+        return base, counts, failures, included_md
 
-        include_md_ref = inc.group(1)
-        include_md_rel = resolve_repo_rel(yml_path.parent, include_md_ref, repo_root)
-        if not include_md_rel:
-            base['include_md_path'] = include_md_ref
-            _mark_scan_error(base, 'include_md_unresolvable', counts)
-            results.append(base)
-            if debug:
-                failures.append({'yml_path': repo_rel_yml, 'reason': base['scan_status'], 'include_md_ref': include_md_ref})
-            continue
+    counts['has_include'] += 1
 
-        md_file = repo_root / include_md_rel
-        base['include_md_path'] = include_md_rel
-        base['include_md_github_url'] = make_github_blob_url(repo_slug, branch, include_md_rel)
+    include_md_ref = inc.group(1)
+    include_md_rel = resolve_repo_rel(os.path.dirname(yml_path_str), include_md_ref, root_prefix)
+    if not include_md_rel:
+        base['include_md_path'] = include_md_ref
+        _mark_scan_error(base, 'include_md_unresolvable', counts)
+        if debug:
+            failures.append({'yml_path': repo_rel_yml, 'reason': base['scan_status'], 'include_md_ref': include_md_ref})
+        return base, counts, failures, included_md
 
-        # Register this md as consumed so the standalone pass skips it
-        included_md_paths.add(md_file.resolve())
+    md_file = os.path.join(repo_root, include_md_rel)
+    base['include_md_path'] = include_md_rel
+    base['include_md_github_url'] = make_github_blob_url(blob_prefix, include_md_rel)
 
-        if not md_file.exists():
-            _mark_scan_error(base, 'include_md_missing', counts)
-            results.append(base)
-            if debug:
-                failures.append({'yml_path': repo_rel_yml, 'reason': base['scan_status'], 'include_md_path': include_md_rel})
-            continue
+    # Report this md as consumed so the standalone pass skips it
+    included_md = os.path.realpath(md_file)
 
-        counts['include_md_exists'] += 1
+    if not os.path.exists(md_file):
+        _mark_scan_error(base, 'include_md_missing', counts)
+        if debug:
+            failures.append({'yml_path': repo_rel_yml, 'reason': base['scan_status'], 'include_md_path': include_md_rel})
+        return base, counts, failures, included_md
 
-        md_text = md_file.read_text(encoding='utf-8', errors='ignore')
+    counts['include_md_exists'] += 1
 
-        fm = parse_md_front_matter(md_text)
+    with md_buffer(md_file) as md_bytes:
+        fm = parse_md_front_matter(md_bytes)
         base['md_author_github'] = (fm.get('author') if isinstance(fm, dict) else None) or y_author
         base['md_ms_author'] = (fm.get('ms.author') if isinstance(fm, dict) else None) or y_ms_author
 
-        _scan_md_content(base, md_file, md_text, repo_root, repo_slug, branch,
-                         counts, failures, debug, repo_rel_yml)
-        results.append(base)
+        _scan_md_content(base, md_file, md_bytes, repo_root, root_prefix, repo_files,
+                         docs_prefix, raw_prefix, counts, failures, debug, repo_rel_yml)
+    return base, counts, failures, included_md
 
-    # --- Pass 2: Standalone MD pattern ---
-    # These are .md files that publish as their own Architecture Center page,
-    # identified by having a YAML front matter block with a 'title' field.
-    # Files already consumed as [!INCLUDE] targets are excluded.
-    all_md_files = sorted(
-        {p.resolve(): p for p in docs_path.rglob('*.md')}.values(),
-        key=lambda p: str(p),
-    )
-    counts['standalone_md_total'] = sum(
-        1 for p in all_md_files if p.resolve() not in included_md_paths
-    )
 
-    for md_path in all_md_files:
-        if md_path.resolve() in included_md_paths:
-            continue  # already handled in Pass 1
+def _process_one_md(md_path_str: str):
+    """Scan a single standalone md page using the _init_worker context.
 
-        md_text = md_path.read_text(encoding='utf-8', errors='ignore')
-        fm = parse_md_front_matter(md_text)
+    Returns (record_or_None, counts_delta, failures) — None when the file has
+    no titled front matter and is not an article page.
+    """
+    repo_root = _CTX['repo_root']
+    root_prefix = _CTX['root_prefix']
+    repo_files = _CTX['repo_files']
+    docs_prefix = _CTX['docs_prefix']
+    debug = _CTX['debug']
+    raw_prefix = _CTX['raw_prefix']
+    blob_prefix = _CTX['blob_prefix']
+
+    counts = _new_counts()
+    failures: list = []
+
+    with contextlib.ExitStack() as stack:
+        md_bytes = stack.enter_context(md_buffer(md_path_str))
+        fm = parse_md_front_matter(md_bytes)
 
         # Only treat as a valid scenario page if front matter has a title.
         # This filters out index pages, partial includes, and non-article md files.
         if not isinstance(fm, dict) or not fm.get('title'):
-            continue
+            return None, counts, failures
 
         counts['standalone_md_scanned'] += 1
-        repo_rel_md = md_path.relative_to(repo_root).as_posix()
+        repo_rel_md = os.path.relpath(md_path_str, repo_root).replace(os.sep, '/')
 
-        base = _make_base_record(repo_slug, branch)
+        base = _make_base_record()
         # For standalone MDs, yml_url is derived from the .md path itself.
         # yml_path is set to the md path so downstream tools (run_compare_only)
         # can use it for matching; include_md_path mirrors it for consistency.
         base['yml_url'] = make_learn_url_from_docs_path(repo_rel_md)
-        base['yml_github_url'] = make_github_blob_url(repo_slug, branch, repo_rel_md)
+        base['yml_github_url'] = make_github_blob_url(blob_prefix, repo_rel_md)
         base['yml_path'] = repo_rel_md          # the .md IS the page source
         base['include_md_path'] = repo_rel_md   # same file — content is here
-        base['include_md_github_url'] = make_github_blob_url(repo_slug, branch, repo_rel_md)
+        base['include_md_github_url'] = make_github_blob_url(blob_prefix, repo_rel_md)
 
         base['title'] = fm.get('title')
         base['description'] = fm.get('description')
@@ -564,10 +987,111 @@ def scan(repo_root: Path, repo_slug: str, branch: str, docs_root: str, debug: bo
         base['md_author_github'] = fm.get('author')
         base['md_ms_author'] = fm.get('ms.author')
 
-        _scan_md_content(base, md_path, md_text, repo_root, repo_slug, branch,
-                         counts, failures, debug, repo_rel_md)
-        results.append(base)
+        _scan_md_content(base, md_path_str, md_bytes, repo_root, root_prefix, repo_files,
+                         docs_prefix, raw_prefix, counts, failures, debug, repo_rel_md)
+    return base, counts, failures
+
+
+_POOL_CHUNK = 32          # paths per submitted task — amortizes IPC
+_POOL_WINDOW_CHUNKS = 4   # pending chunks per worker before the consumer must drain
+
+
+def _run_chunk(worker_fn, chunk):
+    """Worker-side runner: one submitted task covers a whole chunk of paths."""
+    return [worker_fn(p) for p in chunk]
 
+
+def _map_outcomes(worker_fn, paths, initargs):
+    """Yield worker_fn outcomes over paths, pooled when the batch justifies it.
+
+    Lazy in both modes. Pooled submission is windowed — at most
+    workers * _POOL_WINDOW_CHUNKS chunks are in flight or buffered at once,
+    draining the oldest before submitting more — so a slow consumer cannot
+    accumulate unbounded completed results the way executor.map (which
+    submits every task up front) would. Order is preserved.
+    """
+    workers = os.cpu_count() or 1
+    if len(paths) >= _PARALLEL_MIN_FILES and workers > 1:
+        window = workers * _POOL_WINDOW_CHUNKS
+        pending: deque = deque()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=initargs) as executor:
+            for i in range(0, len(paths), _POOL_CHUNK):
+                if len(pending) >= window:
+                    yield from pending.popleft().result()
+                pending.append(executor.submit(_run_chunk, worker_fn, paths[i:i + _POOL_CHUNK]))
+            while pending:
+                yield from pending.popleft().result()
+    else:
+        # small batches run in-process through the exact same worker function
+        _init_worker(*initargs)
+        yield from map(worker_fn, paths)
+
+
+def iter_scan(repo_root: Path, repo_slug: str, branch: str, docs_root: str,
+              debug: bool, counts: dict, failures: list):
+    """Yield result records one at a time, updating counts/failures in place.
+
+    Generator form so callers can stream records straight to disk (--jsonl)
+    without the whole result set resident; scan() wraps it for callers that
+    want the materialized list.
+    """
+    docs_path = repo_root / docs_root
+    repo_root_str = os.fspath(repo_root)
+    root_prefix = os.fspath(repo_root.resolve()) + os.sep  # one realpath walk for the whole run
+    # Single scandir walk of docs_root: the same pass that finds the YAML files
+    # also indexes every file path, so image existence checks become set
+    # lookups instead of a stat() syscall per reference.
+    all_files = sorted(iter_files(docs_path))
+    repo_files = {
+        os.path.relpath(p, repo_root_str).replace(os.sep, '/') for p in all_files
+    }
+    docs_prefix = docs_root.strip('/') + '/'
+    yml_files = [p for p in all_files if p.endswith(('.yml', '.yaml'))]
+
+    counts['yml_total'] = len(yml_files)
+
+    # --- Pass 1: YML+MD pattern (existing behaviour) ---
+    # Track every .md path that is consumed as an [!INCLUDE] target so we can
+    # exclude them from the standalone-MD pass below.
+    included_md_paths: set = set()  # resolved absolute paths
+
+    initargs = (repo_root_str, root_prefix, repo_slug, branch,
+                repo_files, docs_prefix, debug)
+    for base, counts_delta, worker_failures, included_md in _map_outcomes(
+            _process_one_yml, yml_files, initargs):
+        for k, v in counts_delta.items():
+            counts[k] += v
+        failures.extend(worker_failures)
+        if included_md is not None:
+            included_md_paths.add(included_md)
+        yield base
+
+    # --- Pass 2: Standalone MD pattern ---
+    # These are .md files that publish as their own Architecture Center page,
+    # identified by having a YAML front matter block with a 'title' field.
+    # Files already consumed as [!INCLUDE] targets are excluded. The md list
+    # comes from the same sorted scandir walk that indexed the tree up top —
+    # no second directory traversal.
+    standalone_md_files = [
+        p for p in all_files
+        if p.endswith('.md') and os.path.realpath(p) not in included_md_paths
+    ]
+    counts['standalone_md_total'] = len(standalone_md_files)
+
+    for base, counts_delta, worker_failures in _map_outcomes(
+            _process_one_md, standalone_md_files, initargs):
+        for k, v in counts_delta.items():
+            counts[k] += v
+        failures.extend(worker_failures)
+        if base is not None:
+            yield base
+
+
+def scan(repo_root: Path, repo_slug: str, branch: str, docs_root: str, debug: bool):
+    counts = _new_counts()
+    failures: list = []
+    results = list(iter_scan(repo_root, repo_slug, branch, docs_root, debug, counts, failures))
     return results, counts, failures
 
 
@@ -578,26 +1102,90 @@ def main():
     ap.add_argument('--docs-root', default='docs')
     ap.add_argument('--output', default='scan-results.json')
     ap.add_argument('--debug', action='store_true', help='Write scan-debug.json with counts + sample failures')
+    ap.add_argument('--pretty', action='store_true', help='Indent the output JSON (default: compact, for CI)')
+    ap.add_argument('--jsonl', action='store_true',
+                    help='Stream output as JSON Lines: one metadata header line, then one record per line (bounds memory on huge repos)')
     args = ap.parse_args()
 
     repo_slug = args.repo or os.getenv('GITHUB_REPOSITORY') or 'MicrosoftDocs/architecture-center'
     repo_root = Path.cwd()
 
-    items, counts, failures = scan(repo_root, repo_slug, args.branch, args.docs_root, args.debug)
-
-    out = {
-        'repo': repo_slug,
-        'branch': args.branch,
-        'docs_root': args.docs_root,
-        'count': len(items),
-        'items': items,
-    }
-
-    Path(args.output).write_text(json.dumps(out, indent=2), encoding='utf-8')
+    if args.jsonl:
+        # JSON Lines: records are written as they come off the scan, so peak
+        # memory is bounded by the pool's submission window (a few chunks of
+        # records), not by repo size. The first line
+        # is the run metadata (no count — the total is not known up front).
+        counts = _new_counts()
+        failures: list = []
+        n = 0
+        with open(args.output, 'wb') as f:
+            header = {'repo': repo_slug, 'branch': args.branch, 'docs_root': args.docs_root}
+            f.write((orjson.dumps(header) if orjson is not None
+                     else json.dumps(header, separators=(',', ':')).encode('utf-8')) + b'\n')
+            for item in iter_scan(repo_root, repo_slug, args.branch, args.docs_root,
+                                  args.debug, counts, failures):
+                n += 1
+                f.write((orjson.dumps(item) if orjson is not None
+                         else json.dumps(item, separators=(',', ':')).encode('utf-8')) + b'\n')
+        items_written = n
+    elif args.pretty:
+        # pretty output is for eyeballing small runs — the in-memory tree and
+        # a single indented dump are fine there
+        items, counts, failures = scan(repo_root, repo_slug, args.branch, args.docs_root, args.debug)
+
+        out = {
+            'repo': repo_slug,
+            'branch': args.branch,
+            'docs_root': args.docs_root,
+            'count': len(items),
+            'items': items,
+        }
+        if orjson is not None:
+            Path(args.output).write_bytes(orjson.dumps(out, option=orjson.OPT_INDENT_2))
+        else:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(out, f, indent=2)
+        items_written = len(items)
+    else:
+        # Default (compact) mode: the wrapped {..., count, items: [...]} doc
+        # is assembled by splicing, so no items list is ever held in memory.
+        # Records stream to a sidecar file as the scan produces them (peak
+        # memory: the pool's submission window of records); count is only
+        # known at the end, so the header is written second and the sidecar
+        # is copied in as the items array body.
+        counts = _new_counts()
+        failures = []
+        tmp_path = args.output + '.items.tmp'
+        n = 0
+        try:
+            with open(tmp_path, 'wb') as tf:
+                for item in iter_scan(repo_root, repo_slug, args.branch, args.docs_root,
+                                      args.debug, counts, failures):
+                    if n:
+                        tf.write(b',')
+                    tf.write(orjson.dumps(item) if orjson is not None
+                             else json.dumps(item, separators=(',', ':')).encode('utf-8'))
+                    n += 1
+            header = {'repo': repo_slug, 'branch': args.branch,
+                      'docs_root': args.docs_root, 'count': n}
+            head = (orjson.dumps(header) if orjson is not None
+                    else json.dumps(header, separators=(',', ':')).encode('utf-8'))
+            with open(args.output, 'wb') as f:
+                # strip the header's closing brace and continue the object
+                f.write(head[:-1] + b',"items":[')
+                with open(tmp_path, 'rb') as tf:
+                    shutil.copyfileobj(tf, f, 1024 * 1024)
+                f.write(b']}')
+        finally:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        items_written = n
     print(
         f"Scanning docs_root={args.docs_root}: yml_total={counts['yml_total']}; "
         f"standalone_md_scanned={counts['standalone_md_scanned']}; "
-        f"wrote={len(items)}; in_scope={counts['in_scope']}; out_of_scope={counts['out_of_scope']}; "
+        f"wrote={items_written}; in_scope={counts['in_scope']}; out_of_scope={counts['out_of_scope']}; "
         f"passed={counts['passed']}; failed={counts['failed']}; "
         f"md_has_any_calc_link={counts['md_has_any_calc_link']}; md_has_usable_estimate_link={counts['md_has_usable_estimate_link']}"
     )
@@ -608,7 +1196,11 @@ def main():
             'failures_total': len(failures),
             'failures_sample': failures[:1000],
         }
-        Path('scan-debug.json').write_text(json.dumps(dbg, indent=2), encoding='utf-8')
+        # debug output is for humans, so always indented; orjson when available
+        if orjson is not None:
+            Path('scan-debug.json').write_bytes(orjson.dumps(dbg, option=orjson.OPT_INDENT_2))
+        else:
+            Path('scan-debug.json').write_text(json.dumps(dbg, indent=2), encoding='utf-8')
         print(f"Wrote debug to scan-debug.json (failures_total={len(failures)})")
 
 